@@ -332,22 +332,21 @@ elif st.session_state.page == "input":
             st.error("❌ Please enter both repository URL and issue number.")
         else:
             result = None
-            # Check cache first
-            cached_result = get_cached_analysis(repo_url, issue_number)
-            if cached_result:
-                result = cached_result
-            else:
-                with st.spinner("⏳ Fetching issue..."):
-                    issue_data = fetch_github_issue(repo_url, issue_number)
+            # Fetch first so edited issues are re-analyzed; unchanged text hits the content cache
+            with st.spinner("⏳ Fetching issue..."):
+                issue_data = fetch_github_issue(repo_url, issue_number)
 
-                if "error" in issue_data:
+            if "error" in issue_data:
+                # Serve the last analysis of this issue if GitHub is unavailable
+                result = get_cached_analysis(repo_url, issue_number)
+                if not result:
                     st.error(f"❌ Error: {issue_data['error']}")
-                else:
-                    with st.spinner("🤖 Analyzing with AI..."):
-                        result = analyze_issue_with_ai(issue_data)
-                    
-                    if result and "error" not in result:
-                        cache_analysis(repo_url, issue_number, result)
+            else:
+                with st.spinner("🤖 Analyzing with AI..."):
+                    result = analyze_issue_with_ai(issue_data)
+                
+                if result and "error" not in result:
+                    cache_analysis(repo_url, issue_number, issue_data, result)
 
             if result and "error" not in result:
                 st.session_state.result = result
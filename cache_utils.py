@@ -5,28 +5,157 @@ Implements local file-based caching to reduce redundant API calls
 and provide faster repeat analyses.
 """
 
-import json
+import hashlib
 import os
+import shutil
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional
 
+import orjson
+import zstandard as zstd
+
 
 CACHE_DIR = Path(".cache")
 
+# Cache entries are compact JSON compressed with zstd. Compression contexts are
+# reused across calls but aren't thread-safe, so each thread gets its own pair.
+_ZSTD_CONTEXTS = threading.local()
+
+# In-process LRU memo of analysis entries: cache key -> JSON bytes, or None for a miss
+_MEMO = OrderedDict()
+_MEMO_MAXSIZE = 1024
+_MEMO_LOCK = threading.Lock()
+_MISSING = object()
+
+# Single-pass URL -> filename mapping ('/' becomes '_', ':' is dropped)
+_FILENAME_TRANS = str.maketrans({'/': '_', ':': None})
+
 
 def _ensure_cache_dir():
     """Create cache directory if it doesn't exist."""
-    CACHE_DIR.mkdir(exist_ok=True)
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+    except OSError:
+        pass  # Read-only filesystem: lookups miss and writes fail silently
+
+
+# Created once at import so lookups don't pay a mkdir per call
+_ensure_cache_dir()
+
+
+def _zstd_contexts() -> tuple:
+    """Return this thread's (compressor, decompressor) pair."""
+    if not hasattr(_ZSTD_CONTEXTS, "cctx"):
+        _ZSTD_CONTEXTS.cctx = zstd.ZstdCompressor(level=3)
+        _ZSTD_CONTEXTS.dctx = zstd.ZstdDecompressor()
+    return _ZSTD_CONTEXTS.cctx, _ZSTD_CONTEXTS.dctx
 
 
 def _get_cache_key(repo_url: str, issue_number: int) -> str:
     """Generate a unique cache key for an issue."""
-    return f"{repo_url.replace('/', '_').replace(':', '')}_issue_{issue_number}.json"
+    return f"{repo_url.translate(_FILENAME_TRANS)}_issue_{issue_number}.json.zst"
+
+
+def _read_from_disk(key: str) -> Optional[bytes]:
+    """Read and decompress a cache file's JSON bytes, or return None if missing."""
+    try:
+        with open(CACHE_DIR / key, 'rb') as f:
+            return _zstd_contexts()[1].decompress(f.read())
+    except Exception:
+        return None  # Missing or corrupt cache file
+
+
+def _load_from_disk(key: str) -> Optional[dict]:
+    """Read and decode a cache file, or return None if missing or unreadable."""
+    data = _read_from_disk(key)
+    if data is None:
+        return None
+    try:
+        return orjson.loads(data)
+    except Exception:
+        return None
+
+
+def _write_to_disk(key: str, data: bytes):
+    """
+    Atomically write a zstd-compressed cache file.
+    
+    Data goes to a uniquely named temp file in the cache directory and is
+    then renamed over the target, so readers never see a torn file and
+    concurrent writers can't interleave.
+    """
+    cache_file = CACHE_DIR / key
+    tmp_file = cache_file.with_name(f"{cache_file.name}.tmp.{os.urandom(4).hex()}")
+    
+    try:
+        with open(tmp_file, 'wb') as f:
+            f.write(_zstd_contexts()[0].compress(data))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, cache_file)
+    except Exception:
+        try:
+            tmp_file.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def _memo_get(key: str) -> Optional[dict]:
+    """
+    Look up an analysis through the in-process memo so hot issues skip the filesystem.
+    
+    The memo holds the raw JSON bytes (or None for a miss), so every caller
+    decodes its own dict and mutating a result can't leak into later lookups.
+    """
+    with _MEMO_LOCK:
+        data = _MEMO.get(key, _MISSING)
+        if data is not _MISSING:
+            _MEMO.move_to_end(key)
+    
+    if data is _MISSING:
+        data = _read_from_disk(key)
+        _memo_put(key, data)
+    
+    if data is None:
+        return None
+    try:
+        return orjson.loads(data)
+    except Exception:
+        return None
+
+
+def _memo_put(key: str, data: Optional[bytes]):
+    """Record one key in the memo, evicting the least recently used entry when full."""
+    with _MEMO_LOCK:
+        _MEMO[key] = data
+        _MEMO.move_to_end(key)
+        if len(_MEMO) > _MEMO_MAXSIZE:
+            _MEMO.popitem(last=False)
+
+
+def _memo_write(key: str, result: dict):
+    """Write an analysis to disk and refresh only its own memo entry."""
+    data = orjson.dumps(result)
+    try:
+        _write_to_disk(key, data)
+    except Exception:
+        with _MEMO_LOCK:
+            _MEMO.pop(key, None)  # Drop any memoized miss or stale entry
+        return  # Silently fail cache write
+    _memo_put(key, data)
 
 
 def get_cached_analysis(repo_url: str, issue_number: int) -> Optional[dict]:
     """
-    Retrieve cached analysis result if available.
+    Retrieve the most recent cached analysis for an issue, if available.
+    
+    The (repo, issue) entry only points at the content hash of the issue
+    text that was last analyzed, so this may be stale if the issue has been
+    edited since. It is meant as a fallback when the issue can't be fetched;
+    otherwise prefer get_cached_analysis_by_content.
     
     Args:
         repo_url: GitHub repository URL
@@ -35,39 +164,116 @@ def get_cached_analysis(repo_url: str, issue_number: int) -> Optional[dict]:
     Returns:
         Cached analysis dict, or None if not cached
     """
-    _ensure_cache_dir()
-    cache_file = CACHE_DIR / _get_cache_key(repo_url, issue_number)
-    
-    if cache_file.exists():
-        try:
-            with open(cache_file, 'r') as f:
-                return json.load(f)
-        except Exception:
-            return None
-    return None
+    pointer = _memo_get(_get_cache_key(repo_url, issue_number))
+    if not pointer or "content" not in pointer:
+        return None
+    return _memo_get(_get_content_cache_key(pointer["content"]))
 
 
-def cache_analysis(repo_url: str, issue_number: int, result: dict):
+def cache_analysis(repo_url: str, issue_number: int, issue_data: dict, result: dict):
     """
     Store analysis result in cache.
     
+    The result is stored under the hash of the issue text, and the
+    (repo, issue) entry is pointed at that hash.
+    
     Args:
         repo_url: GitHub repository URL
         issue_number: Issue number
+        issue_data: Dict with "title", "body" and "comments" keys that was analyzed
         result: Analysis result to cache
     """
-    _ensure_cache_dir()
-    cache_file = CACHE_DIR / _get_cache_key(repo_url, issue_number)
+    content_key = _content_key(issue_data)
+    if _memo_get(_get_content_cache_key(content_key)) != result:
+        _memo_write(_get_content_cache_key(content_key), result)
+    
+    # Repeat views of an unchanged issue leave the pointer alone
+    pointer = {"content": content_key}
+    if _memo_get(_get_cache_key(repo_url, issue_number)) != pointer:
+        _memo_write(_get_cache_key(repo_url, issue_number), pointer)
+
+
+def _content_key(issue_data: dict) -> str:
+    """Hash the normalized issue text; the AI analysis is a pure function of it."""
+    text = "\x00".join(
+        (issue_data.get(field) or "").strip() for field in ("title", "body", "comments")
+    )
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _get_content_cache_key(content_key: str) -> str:
+    """Generate the cache key for an analysis of a given issue text hash."""
+    return f"content_{content_key}.json.zst"
+
+
+def get_cached_analysis_by_content(issue_data: dict) -> Optional[dict]:
+    """
+    Retrieve a cached analysis for identical issue text, from any repository.
+    
+    Args:
+        issue_data: Dict with "title", "body" and "comments" keys
+        
+    Returns:
+        Cached analysis dict, or None if this text hasn't been analyzed
+    """
+    return _memo_get(_get_content_cache_key(_content_key(issue_data)))
+
+
+def cache_analysis_by_content(issue_data: dict, result: dict):
+    """
+    Store an analysis result keyed on the issue text.
     
+    Edited issues hash differently and miss automatically, while identical
+    issues (e.g. template bugs filed across repositories) share one entry.
+    
+    Args:
+        issue_data: Dict with "title", "body" and "comments" keys
+        result: Analysis result to cache
+    """
+    _memo_write(_get_content_cache_key(_content_key(issue_data)), result)
+
+
+def _get_response_cache_key(url: str) -> str:
+    """Generate a cache key for a raw GitHub API response."""
+    # Hash the URL: query strings ('?', '&', '=') aren't filename-safe on every platform
+    return f"etag_{hashlib.blake2b(url.encode(), digest_size=16).hexdigest()}.json.zst"
+
+
+def get_cached_response(url: str) -> Optional[dict]:
+    """
+    Retrieve a cached GitHub API response and its ETag.
+    
+    Args:
+        url: GitHub API URL the response was fetched from
+        
+    Returns:
+        Dict with "etag" and "payload" keys, or None if not cached
+    """
+    return _load_from_disk(_get_response_cache_key(url))
+
+
+def cache_response(url: str, etag: str, payload):
+    """
+    Store a GitHub API response alongside its ETag for conditional requests.
+    
+    Args:
+        url: GitHub API URL the response was fetched from
+        etag: ETag header returned with the response
+        payload: Decoded JSON body of the response
+    """
     try:
-        with open(cache_file, 'w') as f:
-            json.dump(result, f, indent=2)
+        _write_to_disk(
+            _get_response_cache_key(url),
+            orjson.dumps({"etag": etag, "payload": payload})
+        )
     except Exception:
         pass  # Silently fail cache write
 
 
 def clear_cache():
-    """Clear all cached analyses."""
-    if CACHE_DIR.exists():
-        for file in CACHE_DIR.glob("*.json"):
-            file.unlink()
+    """Clear all cached analyses and API responses."""
+    # Drop the whole directory instead of unlinking entries one by one
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+    _ensure_cache_dir()
+    with _MEMO_LOCK:
+        _MEMO.clear()
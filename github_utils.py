@@ -5,8 +5,80 @@ This module handles all GitHub API interactions, including issue fetching,
 comment retrieval, and error handling for network requests.
 """
 
-import requests
+import asyncio
+import contextlib
+import math
 import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from cache_utils import get_cached_response, cache_response
+
+# requests, aiohttp and simdjson are imported on first use to keep module import cheap
+if TYPE_CHECKING:
+    import aiohttp
+    import requests
+    import simdjson
+
+
+# Shared session so repeated calls reuse keep-alive connections (no extra TLS handshakes);
+# created on first use by _get_session()
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+# Comments are paged at GitHub's maximum page size, and pages are fetched concurrently
+_COMMENTS_PER_PAGE = 100
+_PAGE_EXECUTOR = ThreadPoolExecutor(max_workers=8)
+
+# rel="next" entry of a Link header, e.g. <https://api.github.com/...&page=2>; rel="next"
+_NEXT_LINK = re.compile(r'<([^>]+)>\s*;\s*rel="?next"?')
+
+# simdjson parsers are reused to avoid reallocating buffers, but a parser isn't
+# thread-safe and only holds one document at a time, so each thread gets its own
+_PARSERS = threading.local()
+
+# Negative cache of GitHub error responses, keyed on (owner, repo, issue_number),
+# so immediate retries during rate limits or for missing issues stay off the network
+_ERROR_CACHE = {}
+_ERROR_CACHE_MAXSIZE = 1024
+_ERROR_CACHE_LOCK = threading.Lock()
+_ERROR_TTL = 60  # seconds, when GitHub doesn't say how long to back off
+# Statuses worth remembering; other errors (e.g. transient 5xx) are only
+# cached when GitHub sends explicit back-off headers
+_CACHEABLE_ERROR_STATUSES = (403, 404, 429)
+
+_ASYNC_TIMEOUT_SECONDS = 10
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Issue, body and comments in one round-trip (one rate-limit point instead of two).
+# issueOrPullRequest keeps pull request numbers working, as REST /issues/{n} does.
+_ISSUE_FIELDS = "title body comments(first: 100, after: $cursor) { nodes { body } pageInfo { hasNextPage endCursor } }"
+
+_ISSUE_QUERY = f"""
+query($owner: String!, $name: String!, $n: Int!, $cursor: String) {{
+  repository(owner: $owner, name: $name) {{
+    issueOrPullRequest(number: $n) {{
+      ... on Issue {{ {_ISSUE_FIELDS} }}
+      ... on PullRequest {{ {_ISSUE_FIELDS} }}
+    }}
+  }}
+}}
+"""
+
+# Exclusive upper bound for issue numbers (GraphQL Int is a signed 32-bit integer)
+_MAX_ISSUE_NUMBER = 2 ** 31
+
+# Issues per aliased GraphQL request, keeping query cost and response size modest
+_BULK_BATCH_SIZE = 30
+
+_BULK_ISSUE_FIELDS = "title body comments(first: 100) { nodes { body } pageInfo { hasNextPage } }"
+
+# Either type of issue; pull request numbers resolve too, as with REST /issues/{n}
+_BULK_ISSUE_UNION = f"... on Issue {{ {_BULK_ISSUE_FIELDS} }} ... on PullRequest {{ {_BULK_ISSUE_FIELDS} }}"
 
 
 def fetch_github_issue(repo_url: str, issue_number: int) -> dict:
@@ -26,49 +98,536 @@ def fetch_github_issue(repo_url: str, issue_number: int) -> dict:
         
     Handles edge cases:
         - Missing comments (issues with no discussion)
+        - Long discussions (all comment pages fetched concurrently)
         - Long issue bodies (truncated gracefully by API)
-        - Rate limiting (returns API error)
+        - Rate limiting (returns API error, remembered until GitHub's
+          Retry-After / X-RateLimit-Reset, or 60 seconds)
         - Invalid repository URLs
     """
+    import requests
+
     try:
         # Parse repository owner and name from URL
         owner, repo = repo_url.replace("https://github.com/", "").split("/")[:2]
 
+        # Don't hit GitHub again while a recent error for this issue is still fresh
+        cached_error = _get_cached_error(owner, repo, issue_number)
+        if cached_error:
+            return cached_error
+
         # Setup headers with GitHub token if available (for higher rate limits)
         headers = {}
         token = os.getenv("GITHUB_TOKEN")
         if token:
             headers["Authorization"] = f"token {token}"
 
-        # GitHub API endpoints
-        issue_url = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}"
-        comments_url = f"{issue_url}/comments"
+        # GraphQL requires authentication, so anonymous callers use the REST API
+        if token:
+            return _fetch_issue_graphql(owner, repo, issue_number, headers)
+        return _fetch_issue_rest(owner, repo, issue_number, headers)
 
-        # Fetch issue details and comments
-        issue_resp = requests.get(issue_url, headers=headers, timeout=10)
-        comments_resp = requests.get(comments_url, headers=headers, timeout=10)
+    except ValueError:
+        return {"error": "Invalid GitHub URL format"}
+    except requests.exceptions.Timeout:
+        return {"error": "Request timeout - GitHub server took too long"}
+    except requests.exceptions.RequestException as e:
+        return {"error": f"Network error: {str(e)}"}
+    except Exception as e:
+        return {"error": str(e)}
 
-        if issue_resp.status_code != 200:
-            return {"error": f"GitHub API error: {issue_resp.status_code}"}
 
-        # Parse JSON responses
-        issue = issue_resp.json()
-        comments = comments_resp.json() if comments_resp.status_code == 200 else []
+def fetch_github_issues_bulk(repo_url: str, issue_numbers: list) -> dict:
+    """
+    Fetch many GitHub issues from one repository with as few requests as possible.
+    
+    Args:
+        repo_url: Full GitHub repository URL (e.g., https://github.com/facebook/react)
+        issue_numbers: Issue numbers to fetch
+        
+    Returns:
+        Dictionary mapping each issue number to the same shape returned
+        by fetch_github_issue (including "error" on failure); entries that
+        aren't valid issue numbers map to an "error" dict under their original value
+        
+    With a GITHUB_TOKEN, issues are requested in aliased GraphQL batches of
+    up to 30 per round-trip; issues with more than 100 comments are then
+    completed individually. Anonymous callers fall back to one
+    fetch_github_issue call per issue.
+    """
+    import requests
 
-        # Combine comments into single text (handles empty comment case)
-        comments_text = "\n".join([c.get("body", "") for c in comments]) if comments else ""
+    # Normalize and dedupe issue numbers; invalid entries get their own error
+    results, numbers = {}, []
+    for n in issue_numbers:
+        try:
+            if isinstance(n, bool):
+                raise TypeError(n)
+            number = int(n)
+            # Issue numbers are positive and must fit GraphQL's 32-bit Int
+            if not 0 < number < _MAX_ISSUE_NUMBER:
+                raise ValueError(n)
+            numbers.append(number)
+        except (TypeError, ValueError):
+            results[n] = {"error": f"Invalid issue number: {n!r}"}
+    issue_numbers = list(dict.fromkeys(numbers))
 
-        return {
-            "title": issue.get("title", ""),
-            "body": issue.get("body", ""),
-            "comments": comments_text
-        }
+    token = os.getenv("GITHUB_TOKEN")
+    if not token:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results.update(zip(issue_numbers, pool.map(lambda n: fetch_github_issue(repo_url, n), issue_numbers)))
+            return results
+
+    try:
+        owner, repo = repo_url.replace("https://github.com/", "").split("/")[:2]
+        headers = {"Authorization": f"token {token}"}
+
+        # Issues with a still-fresh cached error stay off the network
+        pending = []
+        for n in issue_numbers:
+            cached_error = _get_cached_error(owner, repo, n)
+            if cached_error:
+                results[n] = cached_error
+            else:
+                pending.append(n)
+
+        for start in range(0, len(pending), _BULK_BATCH_SIZE):
+            batch = pending[start:start + _BULK_BATCH_SIZE]
+            results.update(_fetch_issue_batch_graphql(owner, repo, batch, headers))
+        return results
 
     except ValueError:
-        return {"error": "Invalid GitHub URL format"}
+        error = {"error": "Invalid GitHub URL format"}
     except requests.exceptions.Timeout:
-        return {"error": "Request timeout - GitHub server took too long"}
+        error = {"error": "Request timeout - GitHub server took too long"}
     except requests.exceptions.RequestException as e:
+        error = {"error": f"Network error: {str(e)}"}
+    except Exception as e:
+        error = {"error": str(e)}
+    results.update((n, dict(error)) for n in issue_numbers if n not in results)
+    return results
+
+
+async def fetch_github_issue_async(
+    repo_url: str,
+    issue_number: int,
+    session: "aiohttp.ClientSession" = None,
+    semaphore: asyncio.Semaphore = None
+) -> dict:
+    """
+    Asynchronously fetch a GitHub issue and its comments from the REST API.
+    
+    Args:
+        repo_url: Full GitHub repository URL (e.g., https://github.com/facebook/react)
+        issue_number: Issue number to fetch
+        session: Shared aiohttp session; a temporary one is opened if omitted
+        semaphore: Optional semaphore bounding concurrent fetches against GitHub
+        
+    Returns:
+        Same dictionary shape as fetch_github_issue
+    """
+    import aiohttp
+
+    if session is None:
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=_ASYNC_TIMEOUT_SECONDS)) as session:
+            return await fetch_github_issue_async(repo_url, issue_number, session, semaphore)
+
+    try:
+        owner, repo = repo_url.replace("https://github.com/", "").split("/")[:2]
+
+        cached_error = _get_cached_error(owner, repo, issue_number)
+        if cached_error:
+            return cached_error
+
+        headers = {}
+        token = os.getenv("GITHUB_TOKEN")
+        if token:
+            headers["Authorization"] = f"token {token}"
+
+        issue_url = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}"
+        comments_url = f"{issue_url}/comments"
+
+        async with semaphore or contextlib.nullcontext():
+            issue_status, issue, issue_headers = await _get_json_async(session, issue_url, headers)
+            if issue_status != 200:
+                error = f"GitHub API error: {issue_status}"
+                return _cache_error(owner, repo, issue_number, error, issue_status, issue_headers)
+
+            # Skip the comments request when the issue reports none
+            comments = []
+            if issue.get("comments", 0):
+                comments = await _fetch_comments_async(session, comments_url, issue["comments"], headers)
+
+        return _format_rest_issue(issue, comments)
+
+    except ValueError:
+        return {"error": "Invalid GitHub URL format"}
+    except asyncio.TimeoutError:
+        return {"error": "Request timeout - GitHub server took too long"}
+    except aiohttp.ClientError as e:
         return {"error": f"Network error: {str(e)}"}
     except Exception as e:
         return {"error": str(e)}
+
+
+def fetch_github_issues_concurrently(repo_url: str, issue_numbers: list, max_concurrency: int = 10) -> dict:
+    """
+    Fetch many issues concurrently on a single event loop.
+    
+    Synchronous wrapper around fetch_github_issue_async for callers that
+    are not already running inside an event loop.
+    
+    Args:
+        repo_url: Full GitHub repository URL
+        issue_numbers: Issue numbers to fetch
+        max_concurrency: Maximum number of issues in flight at once
+        
+    Returns:
+        Dictionary mapping each issue number to its fetch_github_issue-shaped result
+    """
+    return asyncio.run(_fetch_issues_async(repo_url, list(issue_numbers), max_concurrency))
+
+
+async def _fetch_issues_async(repo_url: str, issue_numbers: list, max_concurrency: int) -> dict:
+    """Fetch issues over one shared session, bounded by a semaphore."""
+    import aiohttp
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=_ASYNC_TIMEOUT_SECONDS)) as session:
+        results = await asyncio.gather(*(
+            fetch_github_issue_async(repo_url, n, session, semaphore) for n in issue_numbers
+        ))
+    return dict(zip(issue_numbers, results))
+
+
+async def _fetch_comments_async(
+    session: "aiohttp.ClientSession",
+    comments_url: str,
+    count: int,
+    headers: dict
+) -> list:
+    """Fetch every page of an issue's comments concurrently."""
+    responses = await asyncio.gather(*(
+        _get_json_async(session, url, headers) for url in _comment_page_urls(comments_url, count)
+    ))
+
+    comments = []
+    for status, page, _ in responses:
+        if status == 200:
+            comments.extend(page)
+
+    # Comments posted since the issue was fetched spill onto further pages
+    next_url = _next_link(responses[-1][2])
+    while next_url:
+        status, page, page_headers = await _get_json_async(session, next_url, headers)
+        if status != 200:
+            break
+        comments.extend(page)
+        next_url = _next_link(page_headers)
+
+    return comments
+
+
+async def _get_json_async(session: "aiohttp.ClientSession", url: str, headers: dict) -> tuple:
+    """GET a JSON resource, returning (status_code, decoded payload or None, response headers)."""
+    async with session.get(url, headers=headers) as resp:
+        if resp.status != 200:
+            return resp.status, None, resp.headers
+        return 200, await resp.json(), resp.headers
+
+
+def _fetch_issue_batch_graphql(owner: str, repo: str, issue_numbers: list, headers: dict) -> dict:
+    """Fetch a batch of issues in one GraphQL request using field aliases."""
+    aliases = "\n".join(f"i{n}: issueOrPullRequest(number: {n}) {{ {_BULK_ISSUE_UNION} }}" for n in issue_numbers)
+    query = f"""
+query($owner: String!, $name: String!) {{
+  repository(owner: $owner, name: $name) {{
+    {aliases}
+  }}
+}}
+"""
+    resp = _get_session().post(
+        GRAPHQL_URL,
+        json={"query": query, "variables": {"owner": owner, "name": repo}},
+        headers=headers,
+        timeout=30
+    )
+    if resp.status_code != 200:
+        error = f"GitHub API error: {resp.status_code}"
+        return {n: _cache_error(owner, repo, n, error, resp.status_code, resp.headers) for n in issue_numbers}
+
+    payload = resp.json()
+    repository = (payload.get("data") or {}).get("repository")
+
+    # Errors whose path names an issue alias belong to that issue; anything else
+    # (rate limits, query errors, a missing repository) applies to the whole batch
+    aliases = {f"i{n}" for n in issue_numbers}
+    alias_errors, batch_errors = {}, []
+    for error in payload.get("errors") or []:
+        path = error.get("path") or []
+        if len(path) >= 2 and path[1] in aliases:
+            alias_errors.setdefault(path[1], error)
+        else:
+            batch_errors.append(error)
+    if repository is None and not batch_errors:
+        batch_errors.append({"message": "Repository not found"})
+    batch_error = batch_errors[0] if batch_errors else None
+
+    results = {}
+    for n in issue_numbers:
+        issue = (repository or {}).get(f"i{n}")
+        if issue is None:
+            alias_error = alias_errors.get(f"i{n}")
+            if alias_error:
+                error = f"GitHub API error: {alias_error.get('message', 'Issue not found')}"
+                # Only an explicit per-issue NOT_FOUND is treated (and cached) as a 404
+                status = 404 if alias_error.get("type") == "NOT_FOUND" else resp.status_code
+            elif batch_error:
+                error = f"GitHub API error: {batch_error.get('message', 'Request failed')}"
+                status = resp.status_code
+            else:
+                error = "GitHub API error: Issue not found"
+                status = resp.status_code
+            results[n] = _cache_error(owner, repo, n, error, status, resp.headers)
+        elif issue["comments"]["pageInfo"]["hasNextPage"]:
+            # Rare long discussions: page through the remaining comments individually
+            results[n] = _fetch_issue_graphql(owner, repo, n, headers)
+        else:
+            results[n] = {
+                "title": issue.get("title", ""),
+                "body": issue.get("body", ""),
+                "comments": "\n".join(node.get("body", "") for node in issue["comments"]["nodes"])
+            }
+    return results
+
+
+def _fetch_issue_graphql(owner: str, repo: str, issue_number: int, headers: dict) -> dict:
+    """Fetch an issue and all of its comments with the GraphQL API."""
+    variables = {"owner": owner, "name": repo, "n": issue_number, "cursor": None}
+    title, body, comments = "", "", []
+
+    while True:
+        resp = _get_session().post(
+            GRAPHQL_URL,
+            json={"query": _ISSUE_QUERY, "variables": variables},
+            headers=headers,
+            timeout=10
+        )
+        if resp.status_code != 200:
+            error = f"GitHub API error: {resp.status_code}"
+            return _cache_error(owner, repo, issue_number, error, resp.status_code, resp.headers)
+
+        payload = resp.json()
+        issue = ((payload.get("data") or {}).get("repository") or {}).get("issueOrPullRequest")
+        if issue is None:
+            errors = payload.get("errors") or [{}]
+            error = f"GitHub API error: {errors[0].get('message', 'Issue not found')}"
+            status = 404 if errors[0].get("type", "NOT_FOUND") == "NOT_FOUND" else resp.status_code
+            return _cache_error(owner, repo, issue_number, error, status, resp.headers)
+
+        title, body = issue.get("title", ""), issue.get("body", "")
+        page = issue["comments"]
+        comments.extend(node.get("body", "") for node in page["nodes"])
+
+        # Only follow the cursor for issues with more than one page of comments
+        if not page["pageInfo"]["hasNextPage"]:
+            break
+        variables["cursor"] = page["pageInfo"]["endCursor"]
+
+    return {
+        "title": title,
+        "body": body,
+        "comments": "\n".join(comments)
+    }
+
+
+def _fetch_issue_rest(owner: str, repo: str, issue_number: int, headers: dict) -> dict:
+    """Fetch an issue and its comments with the REST API."""
+    # GitHub API endpoints
+    issue_url = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}"
+    comments_url = f"{issue_url}/comments"
+
+    issue_status, issue, issue_headers = _conditional_get(issue_url, headers, _extract_issue)
+    if issue_status != 200:
+        error = f"GitHub API error: {issue_status}"
+        return _cache_error(owner, repo, issue_number, error, issue_status, issue_headers)
+
+    # The issue reports its comment count; skip the comments request when there are none
+    comments = []
+    if issue.get("comments", 0):
+        comments = _fetch_comments(comments_url, issue["comments"], headers)
+
+    return _format_rest_issue(issue, comments)
+
+
+def _fetch_comments(comments_url: str, count: int, headers: dict) -> list:
+    """Fetch every page of an issue's comments concurrently over the shared session."""
+    responses = list(_PAGE_EXECUTOR.map(
+        lambda url: _conditional_get(url, headers, _extract_comments),
+        _comment_page_urls(comments_url, count)
+    ))
+
+    comments = []
+    for status, page, _ in responses:
+        if status == 200:
+            comments.extend(page)
+
+    # Comments posted since the issue was fetched spill onto further pages
+    next_url = _next_link(responses[-1][2])
+    while next_url:
+        status, page, page_headers = _conditional_get(next_url, headers, _extract_comments)
+        if status != 200:
+            break
+        comments.extend(page)
+        next_url = _next_link(page_headers)
+
+    return comments
+
+
+def _comment_page_urls(comments_url: str, count: int) -> list:
+    """Build the URL of every comments page for an issue with `count` comments."""
+    pages = math.ceil(count / _COMMENTS_PER_PAGE)
+    return [f"{comments_url}?per_page={_COMMENTS_PER_PAGE}&page={page}" for page in range(1, pages + 1)]
+
+
+def _next_link(headers):
+    """Return the rel="next" URL from a Link header, or None on the last page."""
+    # Parsed locally so the aiohttp path doesn't import requests
+    match = _NEXT_LINK.search(headers.get("Link", ""))
+    return match.group(1) if match else None
+
+
+def _format_rest_issue(issue: dict, comments: list) -> dict:
+    """Shape REST issue and comments payloads into the fetch_github_issue result."""
+    # Combine comments into single text (handles empty comment case)
+    comments_text = "\n".join([c.get("body", "") for c in comments]) if comments else ""
+
+    return {
+        "title": issue.get("title", ""),
+        "body": issue.get("body", ""),
+        "comments": comments_text
+    }
+
+
+def _conditional_get(url: str, headers: dict, extract) -> tuple:
+    """
+    GET a JSON resource, revalidating any cached copy with its ETag.
+    
+    A 304 Not Modified reply does not count against the rate limit and is
+    answered from the cached payload, reported with status 200.
+    
+    Args:
+        url: GitHub API URL
+        headers: Request headers (not modified)
+        extract: Callable turning the parsed simdjson document into the
+            plain Python payload that is returned and cached
+    
+    Returns:
+        Tuple of (status_code, extracted payload or None, response headers)
+    """
+    cached = get_cached_response(url)
+    request_headers = dict(headers)
+    if cached:
+        request_headers["If-None-Match"] = cached["etag"]
+
+    resp = _get_session().get(url, headers=request_headers, timeout=10)
+
+    if resp.status_code == 304 and cached:
+        return 200, cached["payload"], resp.headers
+    if resp.status_code != 200:
+        return resp.status_code, None, resp.headers
+
+    payload = extract(_get_parser().parse(resp.content))
+    etag = resp.headers.get("ETag")
+    if etag:
+        cache_response(url, etag, payload)
+    return 200, payload, resp.headers
+
+
+def _get_session() -> "requests.Session":
+    """Return the shared requests session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+                _SESSION = session
+    return _SESSION
+
+
+def _get_parser() -> "simdjson.Parser":
+    """Return this thread's simdjson parser."""
+    if not hasattr(_PARSERS, "parser"):
+        import simdjson
+
+        _PARSERS.parser = simdjson.Parser()
+    return _PARSERS.parser
+
+
+def _extract_issue(doc) -> dict:
+    """Pull only the fields we use from a lazily parsed issue document."""
+    return {
+        "title": doc.get("title", ""),
+        "body": doc.get("body", ""),
+        "comments": doc.get("comments", 0)
+    }
+
+
+def _extract_comments(doc) -> list:
+    """Pull comment bodies from a lazily parsed comments document."""
+    return [{"body": comment.get("body", "")} for comment in doc]
+
+
+def _get_cached_error(owner: str, repo: str, issue_number: int):
+    """Return a still-fresh cached error for an issue, or None."""
+    key = (owner.lower(), repo.lower(), int(issue_number))
+    with _ERROR_CACHE_LOCK:
+        entry = _ERROR_CACHE.get(key)
+        if entry is None:
+            return None
+        if entry["expires"] <= time.time():
+            del _ERROR_CACHE[key]
+            return None
+    return {"error": entry["error"]}
+
+
+def _cache_error(owner: str, repo: str, issue_number: int, error: str, status: int, headers) -> dict:
+    """
+    Remember a GitHub error response, honoring its back-off headers, and return it.
+    
+    Only 403/404/429 responses, or responses carrying back-off headers, are
+    remembered; other failures are returned without being cached.
+    """
+    has_backoff = "Retry-After" in headers or headers.get("X-RateLimit-Remaining") == "0"
+    if status not in _CACHEABLE_ERROR_STATUSES and not has_backoff:
+        return {"error": error}
+
+    now = time.time()
+    with _ERROR_CACHE_LOCK:
+        # Prune expired entries on write, then cap the size by evicting the soonest to expire
+        for key in [key for key, entry in _ERROR_CACHE.items() if entry["expires"] <= now]:
+            del _ERROR_CACHE[key]
+        if len(_ERROR_CACHE) >= _ERROR_CACHE_MAXSIZE:
+            del _ERROR_CACHE[min(_ERROR_CACHE, key=lambda key: _ERROR_CACHE[key]["expires"])]
+
+        _ERROR_CACHE[(owner.lower(), repo.lower(), int(issue_number))] = {
+            "error": error,
+            "expires": now + _error_ttl(headers)
+        }
+    return {"error": error}
+
+
+def _error_ttl(headers) -> float:
+    """Seconds to keep an error, from Retry-After or X-RateLimit-Reset when present."""
+    retry_after = headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return int(retry_after)
+
+    reset = headers.get("X-RateLimit-Reset", "")
+    if headers.get("X-RateLimit-Remaining") == "0" and reset.isdigit():
+        return max(int(reset) - time.time(), 0)
+
+    return _ERROR_TTL
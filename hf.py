@@ -6,13 +6,67 @@ using optimized prompts for reliable JSON output.
 """
 
 import os
-import json
-from dotenv import load_dotenv
-from google import genai
+import threading
 
-load_dotenv()
+import orjson
 
-client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+from cache_utils import get_cached_analysis_by_content, cache_analysis_by_content
+
+
+# One client for the process, created on first use by _get_client() so importing this
+# module doesn't pay for google.genai and dotenv. Its underlying httpx.Client is reused
+# across calls, and HTTP/2 multiplexes requests over a single kept-alive TLS connection.
+_client = None
+_client_lock = threading.Lock()
+
+_REQUIRED_KEYS = ("summary", "type", "priority_score", "suggested_labels", "potential_impact")
+
+# Structured output schema enforced by Gemini for each analysis
+ANALYSIS_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "summary": {"type": "STRING"},
+        "type": {
+            "type": "STRING",
+            "enum": ["bug", "feature_request", "documentation", "question", "other"]
+        },
+        "priority_score": {"type": "STRING"},
+        "suggested_labels": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "potential_impact": {"type": "STRING"}
+    },
+    "required": list(_REQUIRED_KEYS)
+}
+
+# Static triage rules, sent as the system instruction rather than repeated in every prompt
+SYSTEM_INSTRUCTION = """You are an expert GitHub issue triage assistant with deep experience in software engineering.
+
+Analyze the GitHub issue you are given and extract structured insights:
+- summary: One clear sentence describing the core problem or feature request
+- type: Exactly one of bug, feature_request, documentation, question, other
+- priority_score: A score 1-5 with brief justification (e.g., '4 - Affects core functionality')
+- suggested_labels: Specific, actionable labels
+- potential_impact: Brief sentence on user/business impact if issue is a bug, or value if feature
+
+For issues with minimal info, infer from title and comments."""
+
+# Plain-dict configs are accepted by google-genai and need no import here
+_ANALYSIS_CONFIG = {
+    "system_instruction": SYSTEM_INSTRUCTION,
+    "response_mime_type": "application/json",
+    "response_schema": ANALYSIS_SCHEMA
+}
+
+_BATCH_ANALYSIS_CONFIG = {
+    "system_instruction": SYSTEM_INSTRUCTION + """
+
+You will be given several numbered issues. Return a JSON array with exactly one analysis per issue, in the same order.""",
+    "response_mime_type": "application/json",
+    "response_schema": {"type": "ARRAY", "items": ANALYSIS_SCHEMA}
+}
+
+# Limits per batched call: issue count, and prompt characters (~4 per token) to stay well inside the context window
+_MAX_BATCH_SIZE = 10
+_MAX_BATCH_CHARS = 400_000
 
 
 def analyze_issue_with_ai(issue_data: dict) -> dict:
@@ -39,73 +93,34 @@ def analyze_issue_with_ai(issue_data: dict) -> dict:
         - Malformed JSON responses (with error fallback)
         - Gemini API failures (returns graceful error)
         
+    Caching:
+        - Results are cached by a hash of the issue text, so unchanged or
+          duplicated issues skip the Gemini call entirely
+        
     Prompt Engineering Details:
-        - Uses few-shot-like structure with explicit JSON format
-        - Enforces strict JSON-only output (no explanations)
-        - Provides clear type categories to avoid ambiguity
+        - Static rules are sent once as the system instruction
+        - JSON output is enforced natively via response_schema (no markdown fences)
+        - Type categories are constrained to an enum to avoid ambiguity
         - Asks for justification to improve reasoning
     """
+    cached_result = get_cached_analysis_by_content(issue_data)
+    if cached_result:
+        return cached_result
     
-    # Robust prompt that guides the model to reliable output
-    prompt = f"""You are an expert GitHub issue triage assistant with deep experience in software engineering.
-
-Your task: Analyze the following GitHub issue and extract structured insights.
-
-CRITICAL: Return ONLY valid JSON in this exact format. No explanation, no markdown, just JSON.
-
-{{
-  "summary": "One clear sentence describing the core problem or feature request",
-  "type": "Classify as one of: bug, feature_request, documentation, question, other",
-  "priority_score": "A score 1-5 with brief justification (e.g., '4 - Affects core functionality')",
-  "suggested_labels": ["label1", "label2", "label3"],
-  "potential_impact": "Brief sentence on user/business impact if issue is a bug, or value if feature"
-}}
-
-GitHub Issue Details:
----
-Title: {issue_data.get("title", "")}
-
-Body:
-{issue_data.get("body", "No description provided")}
-
-Community Comments:
-{issue_data.get("comments", "No comments yet")}
----
-
-Remember: 
-1. Output ONLY JSON - no markdown, no explanation
-2. Type must be exactly one of: bug, feature_request, documentation, question, other
-3. Priority must be 1-5
-4. For issues with minimal info, infer from title and comments
-5. Labels should be specific and actionable
-
-RETURN ONLY JSON:"""
+    # Only the issue itself goes in the per-call prompt; rules and schema live in the config
+    prompt = _format_issue(issue_data)
 
     try:
-        # Call Gemini API with specified model and content
-        response = client.models.generate_content(
-            model="gemini-3-flash-preview",  # Using faster flash model for speed
-            contents=prompt
-        )
-        
-        # Parse JSON response - handles both clean and slightly malformed JSON
-        response_text = response.text.strip()
-        
-        # Remove potential markdown code blocks if present
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
-        
-        result = json.loads(response_text)
+        result = _generate_json(prompt, _ANALYSIS_CONFIG)
         
         # Validate and sanitize the response
-        if not all(key in result for key in ["summary", "type", "priority_score", "suggested_labels", "potential_impact"]):
+        if not _is_complete(result):
             return {"error": "Incomplete analysis response"}
-            
+        
+        cache_analysis_by_content(issue_data, result)
         return result
         
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         return {
             "error": "AI response parsing failed",
             "details": "Could not parse AI output as JSON"
@@ -115,3 +130,120 @@ RETURN ONLY JSON:"""
             "error": "Analysis failed",
             "details": str(e)
         }
+
+
+def analyze_issues_batch(issues: list) -> list:
+    """
+    Analyze many GitHub issues with as few Gemini calls as possible.
+    
+    Issues are packed into numbered multi-issue prompts (up to 10 issues or
+    ~100k tokens of text per call) and the model returns a JSON array with
+    one analysis per issue, so the system instruction and round-trip are
+    paid once per batch instead of once per issue.
+    
+    Args:
+        issues: List of issue_data dicts, as accepted by analyze_issue_with_ai
+        
+    Returns:
+        List of analysis dicts in the same order as issues; entries that
+        failed carry an "error" key like analyze_issue_with_ai results
+    """
+    results = [get_cached_analysis_by_content(issue_data) for issue_data in issues]
+    pending = [i for i, result in enumerate(results) if not result]
+
+    for batch in _split_batches(pending, issues):
+        prompt = "\n\n".join(
+            f"Issue {position}:\n{_format_issue(issues[i])}"
+            for position, i in enumerate(batch, start=1)
+        )
+        try:
+            analyses = _generate_json(prompt, _BATCH_ANALYSIS_CONFIG)
+            if not isinstance(analyses, list) or len(analyses) != len(batch):
+                raise ValueError("Batch response does not match the number of issues")
+        except orjson.JSONDecodeError:
+            for i in batch:
+                results[i] = {
+                    "error": "AI response parsing failed",
+                    "details": "Could not parse AI output as JSON"
+                }
+            continue
+        except Exception as e:
+            for i in batch:
+                results[i] = {"error": "Analysis failed", "details": str(e)}
+            continue
+
+        # Map results back by position
+        for i, result in zip(batch, analyses):
+            if _is_complete(result):
+                cache_analysis_by_content(issues[i], result)
+                results[i] = result
+            else:
+                results[i] = {"error": "Incomplete analysis response"}
+
+    return results
+
+
+def _format_issue(issue_data: dict) -> str:
+    """Render an issue as the prompt text sent to Gemini."""
+    return f"""GitHub Issue Details:
+---
+Title: {issue_data.get("title", "")}
+
+Body:
+{issue_data.get("body", "No description provided")}
+
+Community Comments:
+{issue_data.get("comments", "No comments yet")}
+---"""
+
+
+def _get_client():
+    """Return the shared Gemini client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from dotenv import load_dotenv
+                from google import genai
+
+                load_dotenv()
+                _client = genai.Client(
+                    api_key=os.getenv("GEMINI_API_KEY"),
+                    http_options={
+                        "timeout": 30_000,  # milliseconds
+                        "client_args": {"http2": True}
+                    }
+                )
+    return _client
+
+
+def _generate_json(prompt: str, config: dict):
+    """Call Gemini and decode its JSON reply."""
+    # Stream the response so chunks are collected while the rest is still in flight
+    stream = _get_client().models.generate_content_stream(
+        model="gemini-3-flash-preview",  # Using faster flash model for speed
+        contents=prompt,
+        config=config
+    )
+    
+    # Join the chunks once, then parse - the schema guarantees bare JSON
+    return orjson.loads("".join(chunk.text for chunk in stream if chunk.text))
+
+
+def _is_complete(result) -> bool:
+    """Check that an analysis contains every required field."""
+    return isinstance(result, dict) and all(key in result for key in _REQUIRED_KEYS)
+
+
+def _split_batches(indices: list, issues: list):
+    """Group issue indices into batches bounded by issue count and prompt size."""
+    batch, batch_chars = [], 0
+    for i in indices:
+        issue_chars = len(_format_issue(issues[i]))
+        if batch and (len(batch) >= _MAX_BATCH_SIZE or batch_chars + issue_chars > _MAX_BATCH_CHARS):
+            yield batch
+            batch, batch_chars = [], 0
+        batch.append(i)
+        batch_chars += issue_chars
+    if batch:
+        yield batch